@@ -2,29 +2,172 @@ import os
 import re
 import sys
 import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import io
 import json
+import string
+import numpy as np
+import soundfile as sf
 import torch
 import yt_dlp
 import whisperx
 import anthropic
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
 
 
 CLAUDE_API_KEY_FILE_PATH = "resources/claude_api_key.txt"
 PROMPT_TEMPLATE_FILE_PATH = "resources/prompt.txt"
+CLAUDE_CACHE_DIR = "resources/claude_cache"
+CLAUDE_MODEL = "claude-3-7-sonnet-latest"  # Use latest model
+
+# Patterns for parsing Claude responses, compiled once at import time
+# instead of being re-looked-up on every entry
+_SPLIT_RE = re.compile(r'-{3,}')
+# One combined pattern for numbered entries so the whole response is parsed
+# in a single finditer pass instead of 4 searches per ----delimited chunk.
+# The tempered dot (?:(?!-{3,}).) keeps a match from spilling across the
+# --- separator when an entry is missing a field.
+_ENTRY_RE = re.compile(
+    r'(?P<num>\d+)[\s*]*\.\s*\[(?P<word>[^\]\n]+)\]:'
+    r'(?:(?!-{3,}).)*?meaning \[(?P<meaning>[^\]\n]+)\]'
+    r'(?:(?!-{3,}).)*?(?:example|예시): (?P<example>[^\n]+)'
+    r'(?:(?!-{3,}).)*?(?:translation|해석): (?P<translation>[^\n]+)',
+    re.IGNORECASE | re.DOTALL
+)
+# Legacy patterns for non-numbered responses (fallback only)
+_EXAMPLE_RE = re.compile(r'(?:example|예시): (.+)', re.IGNORECASE)
+_TRANSLATION_RE = re.compile(r'(?:translation|해석): (.+)', re.IGNORECASE)
+_LEGACY_WORD_RE = re.compile(r'\[(.+?)\]: (?:뜻|meaning) \[(.+?)\]', re.IGNORECASE)
+
+# Deletion table for filename-safe titles - str.translate skips the regex
+# engine entirely for the per-character punctuation filtering
+_SAFE_TITLE_TBL = {ord(c): None for c in string.punctuation if c not in '-_'}
+
+# Card templates for the Markdown output, built once instead of re-parsing
+# an f-string per entry (trailing double spaces are Markdown line breaks)
+_CARD_TMPL = """### {num}. 📝 **{word}**  
+- **Meaning**: {meaning}  
+- **Example**: *{example}*  
+- **Translation**: {translation}
+
+---"""
+_LEGACY_CARD_TMPL = """### 📝 **{word}**  
+- **Meaning**: {meaning}  
+- **Example**: *{example}*  
+- **Translation**: {translation}
+
+---"""
+
+# Languages to accept manual YouTube captions in, in preference order
+CAPTION_LANGS = ['en', 'ko', 'ja', 'zh']
+
+# VTT cue timing lines ("00:00:01.000 --> 00:00:04.000 ...") and inline tags
+_VTT_TIMING_RE = re.compile(r'^(?:\d{2}:)?\d{2}:\d{2}[.,]\d{3} --> ')
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+
+# Boilerplate Whisper tends to hallucinate on silence or music, matched
+# against whole stripped segments
+_BOILERPLATE_SEGMENTS = {
+    "Thanks for watching!",
+    "Thank you for watching!",
+    "Thank you for watching.",
+    "Please subscribe!",
+    "Don't forget to like and subscribe!",
+    "See you in the next video.",
+}
+
+# Loaded WhisperX models, keyed by (model_name, device, compute_type).
+# Loading re-reads multi-GB weights, so keep models resident across files.
+_MODEL_CACHE: Dict[tuple, Any] = {}
+
+
+def _get_model(model_name: str, device: str, compute_type: str, device_index: int = 0) -> Any:
+    """Load a WhisperX model once and reuse it for subsequent files"""
+    key = (model_name, device, compute_type, device_index)
+    if key not in _MODEL_CACHE:
+        # Greedy decoding (beam_size=1) is plenty for vocabulary extraction,
+        # and not conditioning on previous text avoids the repetition-looping
+        # failure mode that wastes decoder steps on long audio
+        _MODEL_CACHE[key] = whisperx.load_model(
+            model_name, device,
+            device_index=device_index,
+            compute_type=compute_type,
+            asr_options={
+                "beam_size": 1,
+                "condition_on_previous_text": False,
+                "without_timestamps": True,
+            }
+        )
+    return _MODEL_CACHE[key]
+
+
+def _load_wav_audio(audio_file: str) -> np.ndarray:
+    """Read a WAV into the 16kHz mono float32 array WhisperX expects"""
+    # Fast path only holds for WAVs we wrote ourselves (16kHz mono). Files
+    # from older runs may be source-rate stereo - verify before trusting,
+    # and let whisperx.load_audio resample/downmix anything else via ffmpeg.
+    info = sf.info(audio_file)
+    if info.samplerate != 16000 or info.channels != 1:
+        print(f"Audio is {info.samplerate}Hz/{info.channels}ch - resampling with ffmpeg")
+        return whisperx.load_audio(audio_file)
+
+    # libsndfile decodes straight to float32 in C - no ffmpeg process spawn
+    audio, _ = sf.read(audio_file, dtype='float32')
+    return audio
+
+def _atomic_write(path: str, data: str) -> None:
+    """Write a file via a temp path + os.replace so a crash mid-write can't
+    leave a truncated file for the next run's existence checks to trust"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _collapse_repeated_ngrams(text: str, n: int = 4, max_repeats: int = 3) -> str:
+    """Collapse runs of a repeated n-gram down to a single occurrence
+
+    Whisper's decoder can get stuck emitting the same phrase hundreds of
+    times; this keeps that noise out of the text billed to Claude.
+    """
+    tokens = text.split()
+    out = []
+    i = 0
+    while i < len(tokens):
+        ngram = tokens[i:i + n]
+        j = i + n
+        repeats = 1
+        while tokens[j:j + n] == ngram:
+            repeats += 1
+            j += n
+        if repeats > max_repeats:
+            # Keep one occurrence, skip the rest of the run
+            out.extend(ngram)
+            i = j
+        else:
+            out.append(tokens[i])
+            i += 1
+    return " ".join(out)
 
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='YouTube video download, transcription and Claude API processing')
-    parser.add_argument('--url', type=str, required=True, help='YouTube video URL')
+    parser.add_argument('--url', type=str, nargs='+', required=True, help='One or more YouTube video URLs')
     parser.add_argument('--output_dir', type=str, default='output', help='Output directory')
     parser.add_argument('--whisper_model', type=str, default='turbo', help='Whisper model size')
     parser.add_argument('--force', action='store_true', help='Force reprocessing of already processed steps')
     parser.add_argument('--target_language', type=str, default='Korean', help='Target language for vocabulary (e.g., Korean, Japanese, Chinese)')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true', help='Skip the content-addressed Claude response cache')
+    parser.add_argument('--force-transcribe', dest='force_transcribe', action='store_true', help='Always transcribe with WhisperX, even when manual YouTube captions exist')
     return parser.parse_args()
 
+@lru_cache(maxsize=1024)
 def get_video_id(url: str) -> str:
     """Extract video ID from YouTube URL"""
     parsed_url = urlparse(url)
@@ -58,16 +201,22 @@ def setup_video_directories(video_id: str, base_output_dir: str) -> Dict[str, st
         "vocabulary_dir": vocabulary_dir
     }
 
+def _find_existing_wav(audio_dir: str) -> Optional[str]:
+    """Find a previously downloaded WAV - scandir stops at the first .wav
+    instead of materializing the whole directory listing"""
+    with os.scandir(audio_dir) as it:
+        return next((entry.path for entry in it if entry.name.endswith('.wav')), None)
+
 def download_youtube_audio(url: str, audio_dir: str, force: bool = False) -> str:
     """Download audio from YouTube (skip if already exists)"""
     print(f"Processing YouTube video: {url}")
-    
+
     # Check if audio file already exists
-    audio_files = [f for f in os.listdir(audio_dir) if f.endswith('.wav')]
-    if audio_files and not force:
-        audio_file = os.path.join(audio_dir, audio_files[0])
-        print(f"Found existing audio file: {audio_file}")
-        return audio_file
+    if not force:
+        audio_file = _find_existing_wav(audio_dir)
+        if audio_file:
+            print(f"Found existing audio file: {audio_file}")
+            return audio_file
     
     # yt-dlp options
     ydl_opts = {
@@ -76,8 +225,14 @@ def download_youtube_audio(url: str, audio_dir: str, force: bool = False) -> str
         'postprocessors': [{
             'key': 'FFmpegExtractAudio',
             'preferredcodec': 'wav',
-            'preferredquality': '192',
         }],
+        # Produce 16kHz mono directly - WhisperX's input format - so the
+        # audio doesn't need a second ffmpeg decode/resample pass later.
+        # yt-dlp keys postprocessor args by pp_key ('ExtractAudio'),
+        # lowercased - 'FFmpegExtractAudio' would be silently ignored.
+        'postprocessor_args': {
+            'extractaudio': ['-ac', '1', '-ar', '16000'],
+        },
         'quiet': False,
         'no_warnings': False
     }
@@ -91,7 +246,84 @@ def download_youtube_audio(url: str, audio_dir: str, force: bool = False) -> str
     print(f"Download complete: {audio_filename}")
     return audio_filename
 
-def transcribe_with_whisperx(audio_file: str, transcript_dir: str, model_name: str = 'large-v2', force: bool = False) -> str:
+def _vtt_to_text(vtt: str) -> str:
+    """Strip VTT headers, cue timings and tags down to plain caption text"""
+    lines = []
+    for line in vtt.splitlines():
+        line = line.strip()
+        if not line or line.isdigit():
+            continue
+        if line.startswith(('WEBVTT', 'Kind:', 'Language:', 'NOTE')):
+            continue
+        if _VTT_TIMING_RE.match(line):
+            continue
+        line = _VTT_TAG_RE.sub('', line).strip()
+        # Rolling captions repeat the previous line - keep one copy
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+    return " ".join(lines)
+
+def fetch_youtube_captions(url: str, transcript_dir: str) -> Optional[tuple]:
+    """Fetch manual YouTube captions if the video has them
+
+    Returns (caption_text, video_title) - the text is also saved as
+    transcription.txt - or None when no manual captions exist;
+    auto-generated subs are ignored on purpose.
+    """
+    # Probe the subtitle listing without downloading anything
+    probe_opts = {'skip_download': True, 'quiet': True, 'no_warnings': True}
+    with yt_dlp.YoutubeDL(probe_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    subtitles = info.get('subtitles') or {}
+    lang = next((l for l in CAPTION_LANGS if subtitles.get(l)), None)
+    if lang is None:
+        return None
+
+    caption_formats = subtitles[lang]
+    caption = next((c for c in caption_formats if c.get('ext') == 'vtt'), caption_formats[0])
+
+    print(f"Using YouTube captions ({lang}) instead of transcribing")
+    with urlopen(caption['url']) as response:
+        full_text = _vtt_to_text(response.read().decode('utf-8'))
+
+    transcript_file = os.path.join(transcript_dir, "transcription.txt")
+    _atomic_write(transcript_file, full_text)
+    print(f"Captions saved to: {transcript_file}")
+    return full_text, info.get('title')
+
+def get_captions_or_audio(url: str, audio_dir: str, transcript_dir: str, force: bool = False, force_transcribe: bool = False) -> tuple:
+    """Prefer manual captions over the audio download + Whisper pipeline
+
+    Returns ('text', transcript, video_title) when captions or an existing
+    transcript were used (video_title may be None), otherwise
+    ('audio', audio_file, None) for the regular transcription path.
+    """
+    if not force_transcribe:
+        # Reuse an existing transcript exactly like the Whisper path does,
+        # recovering the title from a previously downloaded wav if there is one
+        transcript_file = os.path.join(transcript_dir, "transcription.txt")
+        if os.path.exists(transcript_file) and not force:
+            print(f"Found existing transcription file: {transcript_file}")
+            with open(transcript_file, 'r', encoding='utf-8') as f:
+                transcript = f.read()
+            existing_wav = _find_existing_wav(audio_dir)
+            video_title = os.path.splitext(os.path.basename(existing_wav))[0] if existing_wav else None
+            return 'text', transcript, video_title
+
+        try:
+            captions = fetch_youtube_captions(url, transcript_dir)
+        except Exception as e:
+            # Caption fetch is best-effort - fall back to transcribing
+            print(f"Caption lookup failed ({e}), falling back to transcription")
+            captions = None
+        if captions is not None:
+            transcript, video_title = captions
+            return 'text', transcript, video_title
+
+    return 'audio', download_youtube_audio(url, audio_dir, force=force), None
+
+def transcribe_with_whisperx(audio_file: str, transcript_dir: str, model_name: str = 'large-v2', force: bool = False, device_index: int = 0) -> str:
     """Transcribe audio using WhisperX"""
     # Check if transcription file already exists
     transcript_file = os.path.join(transcript_dir, "transcription.txt")
@@ -102,33 +334,97 @@ def transcribe_with_whisperx(audio_file: str, transcript_dir: str, model_name: s
         return full_text
     
     print(f"Transcribing with WhisperX: {audio_file}")
+
+    # Use CUDA when available - fp16 on GPU, int8 quantization on CPU
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    compute_type = "float16" if device == "cuda" else "int8"
+    print(f"WhisperX running on: {device}:{device_index} ({compute_type})")
+
+    # Load WhisperX model (cached - only the first file pays the load cost)
+    model = _get_model(model_name, device, compute_type, device_index)
     
-    # Force CPU usage
-    device = "cpu"
-    print(f"WhisperX running on: {device}")
-    
-    # Load WhisperX model - use float32 on CPU
-    model = whisperx.load_model(model_name, device, compute_type="float32")
-    
-    # Load audio and transcribe
-    audio = whisperx.load_audio(audio_file)
-    result = model.transcribe(audio, batch_size=16)
+    # Load audio and transcribe - the WAV is already 16kHz mono, so read it
+    # directly instead of going through whisperx.load_audio's ffmpeg run
+    audio = _load_wav_audio(audio_file)
+    # 30s chunks match Whisper's training window - the best WER/throughput point
+    result = model.transcribe(audio, batch_size=16, chunk_size=30, print_progress=False)
     
     # Detect language
     detected_language = result["language"]
     print(f"Detected language: {detected_language}")
     
-    # Extract pure text
-    full_text = " ".join([segment["text"] for segment in result["segments"]])
+    # Extract pure text - generator avoids an intermediate list of all
+    # segments, and hallucinated boilerplate segments are dropped outright
+    full_text = " ".join(
+        segment["text"] for segment in result["segments"]
+        if segment["text"].strip() not in _BOILERPLATE_SEGMENTS
+    )
+
+    # Collapse decoder repetition loops before the text reaches Claude
+    full_text = _collapse_repeated_ngrams(full_text)
     
     # Save text file
-    with open(transcript_file, 'w', encoding='utf-8') as f:
-        f.write(full_text)
-    
+    _atomic_write(transcript_file, full_text)
+
     print(f"Transcription complete. Result saved to: {transcript_file}")
     return full_text
 
-def query_claude_api(text: str, prompt_template_path: str, api_key_path: str, vocabulary_dir: str, target_language: str = "Korean", force: bool = False) -> str:
+@lru_cache(maxsize=None)
+def _read_api_key(api_key_path: str) -> str:
+    """Read the API key once per path - batch runs reuse the cached value"""
+    with open(api_key_path, 'r') as f:
+        return f.readline().strip()
+
+
+@lru_cache(maxsize=None)
+def _read_prompt_template(prompt_template_path: str) -> str:
+    """Read the prompt template once per path"""
+    with open(prompt_template_path, 'r') as f:
+        return f.read().strip()
+
+
+@lru_cache(maxsize=None)
+def _get_client(api_key_path: str) -> Any:
+    # One client per key file - each instance sets up its own httpx pool
+    return anthropic.AsyncAnthropic(api_key=_read_api_key(api_key_path))
+
+
+# Rough context-window guard for Claude requests, at ~4 chars per token
+_MAX_INPUT_TOKENS = 150000
+_CLAUDE_MAX_RETRIES = 5
+
+
+async def _call_claude(client: Any, prompt: str, text: str, raw_response_file: str, mode: str = 'w') -> str:
+    """One streamed Claude call, retried with exponential backoff on rate limits"""
+    full_prompt = f"{prompt}\n\nText:\n{text}"
+
+    # Stream into a .tmp path - the caller promotes it with os.replace once
+    # the whole response is in, so a crash leaves the partial output in .tmp
+    # instead of a truncated file the resume checks would trust
+    for attempt in range(_CLAUDE_MAX_RETRIES):
+        try:
+            chunks = []
+            with open(raw_response_file + '.tmp', mode, encoding='utf-8') as f:
+                async with client.messages.stream(
+                    model=CLAUDE_MODEL,
+                    max_tokens=4000,
+                    messages=[
+                        {"role": "user", "content": full_prompt}
+                    ]
+                ) as stream:
+                    async for chunk in stream.text_stream:
+                        f.write(chunk)
+                        chunks.append(chunk)
+            return "".join(chunks)
+        except anthropic.RateLimitError:
+            if attempt == _CLAUDE_MAX_RETRIES - 1:
+                raise
+            delay = 2 ** attempt
+            print(f"Claude rate limit hit, retrying in {delay}s...")
+            await asyncio.sleep(delay)
+
+
+async def query_claude_api(text: str, prompt_template_path: str, api_key_path: str, vocabulary_dir: str, target_language: str = "Korean", force: bool = False, use_cache: bool = True) -> str:
     """Analyze text using Claude API"""
     # Check if vocabulary file already exists
     vocabulary_file = os.path.join(vocabulary_dir, "vocabulary.md")
@@ -137,124 +433,147 @@ def query_claude_api(text: str, prompt_template_path: str, api_key_path: str, vo
         with open(vocabulary_file, 'r', encoding='utf-8') as f:
             response = f.read()
         return response
-    
+
+    prompt_template = _read_prompt_template(prompt_template_path)
+
+    # Content-addressed cache keyed on the actual request inputs. Unlike the
+    # vocabulary-file check above it survives --force, and prompt or
+    # target-language edits miss it naturally, so no stale hits.
+    cache_file = None
+    if use_cache:
+        cache_key = hashlib.sha256(
+            (CLAUDE_MODEL + target_language + prompt_template + text).encode('utf-8')
+        ).hexdigest()
+        cache_file = os.path.join(CLAUDE_CACHE_DIR, f"{cache_key}.txt")
+        if os.path.exists(cache_file):
+            print(f"Found cached Claude response: {cache_file}")
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return f.read()
+
     print("Calling Claude API...")
-    
-    with open(api_key_path, 'r') as f:
-        api_key = f.readline().strip()
-        
-    with open(prompt_template_path, 'r') as f:
-        prompt_template = f.read().strip()
-    
+
     # Replace target language in the prompt template
     prompt = prompt_template.replace("TARGET_LANGUAGE", target_language)
-    
-    client = anthropic.Anthropic(api_key=api_key)
-    
-    # Construct final prompt
-    full_prompt = f"{prompt}\n\nText:\n{text}"
-    
+
+    client = _get_client(api_key_path)
+
     try:
-        response = client.messages.create(
-            model="claude-3-7-sonnet-latest",  # Use latest model
-            max_tokens=4000,
-            messages=[
-                {"role": "user", "content": full_prompt}
-            ]
-        )
-        claude_response = response.content[0].text
-        
-        # Save raw response (for debugging)
+        # Raw response (for debugging) - written incrementally while
+        # streaming, so a crash mid-call still preserves partial output
         raw_response_file = os.path.join(vocabulary_dir, "raw_response.txt")
-        with open(raw_response_file, 'w', encoding='utf-8') as f:
-            f.write(claude_response)
-            
+
+        # Guard the context window: pathologically long transcripts are split
+        # at a sentence boundary and processed as two calls instead of
+        # silently overflowing and triggering API-side retries
+        if len(text) // 4 > _MAX_INPUT_TOKENS:
+            print(f"Transcript is ~{len(text) // 4} tokens - splitting into two Claude calls")
+            midpoint = text.rfind('. ', 0, len(text) // 2)
+            if midpoint == -1:
+                midpoint = len(text) // 2
+            first_half = await _call_claude(client, prompt, text[:midpoint + 1], raw_response_file)
+            second_half = await _call_claude(client, prompt, text[midpoint + 1:], raw_response_file, mode='a')
+            claude_response = f"{first_half}\n---\n{second_half}"
+        else:
+            claude_response = await _call_claude(client, prompt, text, raw_response_file)
+
+        os.replace(raw_response_file + '.tmp', raw_response_file)
+
+        if cache_file:
+            os.makedirs(CLAUDE_CACHE_DIR, exist_ok=True)
+            _atomic_write(cache_file, claude_response)
+
         return claude_response
     except Exception as e:
         print(f"Error occurred while calling Claude API: {e}")
         return f"Error: {str(e)}"
 
-def save_claude_response(response: str, vocabulary_dir: str, audio_file: str = None) -> str:
+# How many Claude requests may be in flight at once across a batch
+_CLAUDE_CONCURRENCY = 5
+
+
+async def _query_claude_batch(jobs, args):
+    """Fan Claude queries for a batch of transcripts out concurrently
+
+    Each job is (transcript_text, vocabulary_dir). Responses come back in
+    submission order, with the exception object in place of a response for
+    jobs that failed.
+    """
+    semaphore = asyncio.Semaphore(_CLAUDE_CONCURRENCY)
+
+    async def bounded(transcript_text, vocabulary_dir):
+        async with semaphore:
+            return await query_claude_api(
+                transcript_text,
+                PROMPT_TEMPLATE_FILE_PATH,
+                CLAUDE_API_KEY_FILE_PATH,
+                vocabulary_dir,
+                args.target_language,
+                force=args.force,
+                use_cache=not args.no_cache
+            )
+
+    return await asyncio.gather(
+        *[bounded(transcript_text, vocabulary_dir) for transcript_text, vocabulary_dir in jobs],
+        return_exceptions=True
+    )
+
+def save_claude_response(response: str, vocabulary_dir: str, audio_file: str = None, video_title: str = None) -> str:
     """Save Claude API response in Markdown card format"""
     # Generate current date for filename
     current_date = datetime.now().strftime("%Y%m%d")
-    
-    # Extract original video title from audio filename
-    if audio_file:
-        # Get just the filename without extension
-        video_title = os.path.splitext(os.path.basename(audio_file))[0]
-    else:
-        # Fallback to video ID if audio_file is not provided
-        video_title = os.path.basename(os.path.dirname(os.path.dirname(vocabulary_dir)))
+
+    # Extract original video title from audio filename unless given directly
+    # (the caption path has no audio file and passes the title through)
+    if not video_title:
+        if audio_file:
+            # Get just the filename without extension
+            video_title = os.path.splitext(os.path.basename(audio_file))[0]
+        else:
+            # Fallback to video ID if neither title nor audio_file is provided
+            video_title = os.path.basename(os.path.dirname(os.path.dirname(vocabulary_dir)))
     
     # Create a filename-safe version of the title (remove special characters)
-    safe_title = re.sub(r'[^\w\s-]', '', video_title).strip().replace(' ', '_')
+    safe_title = video_title.translate(_SAFE_TITLE_TBL).strip().replace(' ', '_')
     
     vocabulary_file = os.path.join(vocabulary_dir, f"{current_date}_{safe_title}.md")
 
-    # Extract word blocks using regex
-    entries = re.split(r'-{3,}', response.strip())
+    # Build the document in one buffer, one formatted write per card
+    buf = io.StringIO()
 
-    # Convert to card format
-    formatted_entries = []
-    
-    # Try to find numbered expressions
-    numbered_pattern = re.compile(r'^[\s*]*(\d+)[\s*]*\.\s*\[(.+?)\]:', re.MULTILINE)
-    
-    for entry in entries:
-        if not entry.strip():
-            continue  # Skip empty entries
-            
-        # Check if this entry has a numbered expression
-        numbered_match = numbered_pattern.search(entry)
-        
-        if numbered_match:
-            # Handle numbered expressions
-            entry_number = numbered_match.group(1)
-            word = numbered_match.group(2).strip()
-            
-            # Extract meaning, example and translation
-            meaning_match = re.search(r'meaning \[(.+?)\]', entry, re.IGNORECASE)
-            example_match = re.search(r'(?:example|예시): (.+)', entry, re.IGNORECASE)
-            translation_match = re.search(r'(?:translation|해석): (.+)', entry, re.IGNORECASE)
-            
-            if meaning_match and example_match and translation_match:
-                meaning = meaning_match.group(1).strip()
-                example = example_match.group(1).strip()
-                translation = translation_match.group(1).strip()
-                
-                card = f"""### {entry_number}. 📝 **{word}**  
-- **Meaning**: {meaning}  
-- **Example**: *{example}*  
-- **Translation**: {translation}
+    # Use video title as the heading
+    buf.write(f"# {video_title}\n\n")
 
----"""
-                formatted_entries.append(card)
-        else:
-            # Legacy pattern for non-numbered expressions
-            match_word = re.search(r'\[(.+?)\]: (?:뜻|meaning) \[(.+?)\]', entry, re.IGNORECASE)
-            match_example = re.search(r'(?:예시|example): (.+)', entry, re.IGNORECASE)
-            match_translation = re.search(r'(?:해석|translation): (.+)', entry, re.IGNORECASE)
+    n_cards = 0
 
-            if match_word and match_example and match_translation:
-                word = match_word.group(1).strip()
-                meaning = match_word.group(2).strip()
-                example = match_example.group(1).strip()
-                translation = match_translation.group(1).strip()
+    # Single pass over the whole response for numbered expressions
+    for m in _ENTRY_RE.finditer(response):
+        if n_cards:
+            buf.write("\n\n")
+        buf.write(_CARD_TMPL.format_map({k: v.strip() for k, v in m.groupdict().items()}))
+        n_cards += 1
 
-                card = f"""### 📝 **{word}**  
-- **Meaning**: {meaning}  
-- **Example**: *{example}*  
-- **Translation**: {translation}
+    if not n_cards:
+        # Legacy per-entry parsing for non-numbered responses
+        for entry in _SPLIT_RE.split(response.strip()):
+            if not entry.strip():
+                continue  # Skip empty entries
 
----"""
-                formatted_entries.append(card)
+            match_word = _LEGACY_WORD_RE.search(entry)
+            match_example = _EXAMPLE_RE.search(entry)
+            match_translation = _TRANSLATION_RE.search(entry)
 
-    # Use video title as the heading
-    markdown_text = f"# {video_title}\n\n" + "\n\n".join(formatted_entries)
+            if match_word and match_example and match_translation:
+                if n_cards:
+                    buf.write("\n\n")
+                buf.write(_LEGACY_CARD_TMPL.format(
+                    word=match_word.group(1).strip(),
+                    meaning=match_word.group(2).strip(),
+                    example=match_example.group(1).strip(),
+                    translation=match_translation.group(1).strip()
+                ))
+                n_cards += 1
 
-    with open(vocabulary_file, 'w', encoding='utf-8') as f:
-        f.write(markdown_text)
+    _atomic_write(vocabulary_file, buf.getvalue())
 
     print(f"Claude response saved in Markdown card format: {vocabulary_file}")
     return vocabulary_file
@@ -262,55 +581,136 @@ def save_claude_response(response: str, vocabulary_dir: str, audio_file: str = N
 def main():
     # Parse command line arguments
     args = parse_arguments()
-    
-    try:
-        # Extract video ID and set up directories
-        video_id = get_video_id(args.url)
-        directories = setup_video_directories(video_id, args.output_dir)
-        
-        print(f"Starting processing: Video ID {video_id}")
-        print(f"Working directory: {directories['video_dir']}")
-        
-        # 1. Download YouTube video
-        audio_file = download_youtube_audio(
-            args.url, 
-            directories['audio_dir'], 
-            force=args.force
-        )
-        
-        # 2. Transcribe with WhisperX
-        transcript_text = transcribe_with_whisperx(
-            audio_file, 
-            directories['transcript_dir'], 
-            args.whisper_model, 
-            force=args.force
-        )
-        
-        # 3. Query Claude API
-        claude_response = query_claude_api(
-            transcript_text, 
-            PROMPT_TEMPLATE_FILE_PATH, 
-            CLAUDE_API_KEY_FILE_PATH, 
-            directories['vocabulary_dir'],
-            args.target_language,
-            force=args.force
-        )
-        
-        # 4. Save response - pass audio_file to use its name
-        vocabulary_file = save_claude_response(
-            claude_response, 
-            directories['vocabulary_dir'],
-            audio_file
-        )
-        
-        print(f"\nProcessing complete!")
-        print(f"Video ID: {video_id}")
-        print(f"Audio file: {audio_file}")
-        print(f"Transcript file: {os.path.join(directories['transcript_dir'], 'transcription.txt')}")
-        print(f"Vocabulary file: {vocabulary_file}")
-        
-    except Exception as e:
-        print(f"Error occurred during processing: {e}")
+    failed_urls = []
+
+    # Downloads are network-bound and transcription is compute-bound, so they
+    # fully overlap: all downloads run concurrently in a thread pool while
+    # transcription fans out across the available GPUs (one worker per GPU,
+    # files assigned round-robin; a single worker on CPU-only machines).
+    n_gpu = torch.cuda.device_count() or 1
+
+    with contextlib.ExitStack() as stack:
+        download_pool = stack.enter_context(
+            concurrent.futures.ThreadPoolExecutor(max_workers=4))
+        # One single-worker executor per device - the whisperx pipeline isn't
+        # safe for concurrent calls on the same model instance, so each GPU
+        # gets its own serialized queue
+        transcribe_pools = [
+            stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers=1))
+            for _ in range(n_gpu)
+        ]
+        pending = []
+        for url in args.url:
+            try:
+                # Extract video ID and set up directories
+                video_id = get_video_id(url)
+                directories = setup_video_directories(video_id, args.output_dir)
+            except Exception as e:
+                print(f"Error occurred during processing: {e}")
+                failed_urls.append(url)
+                continue
+
+            print(f"Starting processing: Video ID {video_id}")
+            print(f"Working directory: {directories['video_dir']}")
+
+            # 1. Fetch captions or download audio (queued on the download
+            # pool) - manual captions skip the Whisper stage entirely
+            download_future = download_pool.submit(
+                get_captions_or_audio,
+                url,
+                directories['audio_dir'],
+                directories['transcript_dir'],
+                force=args.force,
+                force_transcribe=args.force_transcribe
+            )
+            pending.append((url, video_id, directories, download_future))
+
+        # 2. Transcribe with WhisperX - submitted as each download completes,
+        # assigning files to GPUs in round-robin order
+        audio_files = {}
+        video_titles = {}
+        transcript_futures = {}
+        by_download = {job[3]: job for job in pending}
+        next_worker = 0
+        for download_future in concurrent.futures.as_completed(by_download):
+            url, video_id, directories, _ = by_download[download_future]
+            try:
+                kind, payload, video_title = download_future.result()
+            except Exception as e:
+                print(f"Error occurred during processing: {e}")
+                failed_urls.append(url)
+                continue
+
+            video_titles[url] = video_title
+            if kind == 'text':
+                # Captions already gave us the transcript - no audio, no GPU
+                audio_files[url] = None
+                transcript_future = concurrent.futures.Future()
+                transcript_future.set_result(payload)
+                transcript_futures[url] = transcript_future
+                continue
+
+            audio_file = payload
+            audio_files[url] = audio_file
+            device_index = next_worker % n_gpu
+            transcript_futures[url] = transcribe_pools[device_index].submit(
+                transcribe_with_whisperx,
+                audio_file,
+                directories['transcript_dir'],
+                args.whisper_model,
+                force=args.force,
+                device_index=device_index
+            )
+            next_worker += 1
+
+        # Collect finished transcripts in submission order
+        ready = []
+        for url, video_id, directories, download_future in pending:
+            if url not in transcript_futures:
+                continue  # Download already failed and was reported
+            try:
+                transcript_text = transcript_futures[url].result()
+            except Exception as e:
+                print(f"Error occurred during processing: {e}")
+                failed_urls.append(url)
+                continue
+            ready.append((url, video_id, directories, transcript_text))
+
+        # 3. Query Claude API - all transcripts fan out concurrently on the
+        # async client instead of one blocking round trip each
+        claude_responses = asyncio.run(_query_claude_batch(
+            [(transcript_text, directories['vocabulary_dir'])
+             for _, _, directories, transcript_text in ready],
+            args
+        ))
+
+        # 4. Save responses - pass audio_file to use its name
+        for (url, video_id, directories, _), claude_response in zip(ready, claude_responses):
+            try:
+                if isinstance(claude_response, Exception):
+                    raise claude_response
+
+                audio_file = audio_files[url]
+                vocabulary_file = save_claude_response(
+                    claude_response,
+                    directories['vocabulary_dir'],
+                    audio_file,
+                    video_title=video_titles.get(url)
+                )
+
+                print(f"\nProcessing complete!")
+                print(f"Video ID: {video_id}")
+                if audio_file:
+                    print(f"Audio file: {audio_file}")
+                print(f"Transcript file: {os.path.join(directories['transcript_dir'], 'transcription.txt')}")
+                print(f"Vocabulary file: {vocabulary_file}")
+
+            except Exception as e:
+                print(f"Error occurred during processing: {e}")
+                failed_urls.append(url)
+
+    if failed_urls:
+        print(f"\nFailed to process {len(failed_urls)} URL(s): {', '.join(failed_urls)}")
         sys.exit(1)
         
         